@@ -9,18 +9,30 @@ Uses tidalapi for playlist operations and Tidal v2 API for genre data.
 from __future__ import annotations
 
 import argparse
-import json
 import logging
 import os
+import queue
+import re
 import sys
+import tempfile
+import threading
 import time
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, TypeVar
 
+import orjson
 import requests
 import tidalapi
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from tidalapi.exceptions import TooManyRequests
+from urllib3.util.retry import Retry
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -30,23 +42,134 @@ logging.basicConfig(
 )
 log = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 # --- Utility Functions ---
 def load_json(path: str | Path) -> dict[str, Any]:
     """Load JSON file, return empty dict if not found."""
     path = Path(path)
     if path.exists():
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return orjson.loads(path.read_bytes())
     return {}
 
 
-def save_json(path: str | Path, data: dict[str, Any]) -> None:
-    """Save data to JSON file."""
-    path = Path(path)
+# Read once at import: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def atomic_open(path: Path, mode: str = "w", private: bool = False, **kwargs: Any) -> Iterator[IO[Any]]:
+    """Open a temp file next to path and rename it over path on success.
+
+    Temp files are created owner-only; unless private is set, the final file
+    gets the usual umask-based permissions.
+    """
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, default=str)
+    f = tempfile.NamedTemporaryFile(
+        mode, dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False, **kwargs
+    )
+    try:
+        with f:
+            yield f
+        if not private:
+            os.chmod(f.name, 0o666 & ~_UMASK)
+    except BaseException:
+        os.unlink(f.name)
+        raise
+    os.replace(f.name, path)
+
+
+def save_json(path: str | Path, data: dict[str, Any], private: bool = False) -> None:
+    """Save data to JSON file atomically (owner-only if private)."""
+    with atomic_open(Path(path), "wb", private=private) as f:
+        f.write(orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def _chunk(items: Iterable[T], n: int) -> Iterator[list[T]]:
+    """Yield successive lists of up to n items, consuming items lazily."""
+    items = iter(items)
+    while chunk := list(islice(items, n)):
+        yield chunk
+
+
+# Track ID files: one version byte, then little-endian uint64 IDs
+ID_FILE_VERSION = 1
+
+
+def load_ids(path: str | Path) -> set[str]:
+    """Load a track ID set saved by save_ids, return empty set if not found.
+
+    Legacy JSON files ({"tracks": [...]}) are read too, either at path itself
+    or at the same path with a .json suffix.
+    """
+    path = Path(path)
+    if not path.exists():
+        path = path.with_suffix(".json")
+        if not path.exists():
+            return set()
+
+    with open(path, "rb") as f:
+        header = f.read(1)
+        if not header:
+            return set()
+        if header != bytes([ID_FILE_VERSION]):
+            f.seek(0)
+            return {str(i) for i in orjson.loads(f.read()).get("tracks", [])}
+        ids = array("Q")
+        ids.frombytes(f.read())
+
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return {str(i) for i in ids}
+
+
+def save_ids(path: str | Path, ids: Iterable[str]) -> None:
+    """Save numeric track IDs as a compact binary file atomically.
+
+    IDs are streamed in fixed-size chunks, so no full copy of a large set is built.
+    """
+    ids = iter(ids)
+    with atomic_open(Path(path), "wb") as f:
+        f.write(bytes([ID_FILE_VERSION]))
+        while chunk := array("Q", map(int, islice(ids, 10_000))):
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            chunk.tofile(f)
+
+
+def make_http_session() -> requests.Session:
+    """Create a pooled HTTP session that retries rate-limited and server errors."""
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# --- Rate Limiting ---
+class RateLimiter:
+    """Thread-safe limiter that spaces requests at least min_interval apart.
+
+    Each caller reserves the next free slot under the lock and sleeps outside
+    it, so waiting workers overlap with requests already in flight.
+    """
+
+    def __init__(self, min_interval_seconds: float) -> None:
+        self.min_interval = min_interval_seconds
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller's request slot is due."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        if slot > now:
+            time.sleep(slot - now)
 
 
 # --- Tidal Genre Client ---
@@ -54,6 +177,8 @@ class TidalGenreClient:
     """Client for fetching genre data from Tidal v2 API."""
 
     BASE_URL = "https://openapi.tidal.com/v2"
+    BULK_SIZE = 20
+    NEGATIVE_CACHE_TTL_SECONDS = 7 * 24 * 3600
 
     def __init__(
         self,
@@ -64,16 +189,11 @@ class TidalGenreClient:
         self.session = session
         self.cache_path = Path(cache_path)
         self.cache: dict[str, Any] = load_json(self.cache_path)
-        self.min_interval = min_interval_seconds
-        self.last_request_time = 0.0
-        self._genre_name_cache: dict[str, str] = {}
-
-    def _rate_limit(self) -> None:
-        """Ensure minimum interval between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_request_time = time.time()
+        self.rate_limiter = RateLimiter(min_interval_seconds)
+        self._http = make_http_session()
+        self._dirty = False
+        self._genre_name_cache: dict[str, Future[str]] = {}
+        self._lock = threading.Lock()
 
     def _get_headers(self) -> dict[str, str]:
         """Get authorization headers using session token."""
@@ -83,47 +203,169 @@ class TidalGenreClient:
         }
 
     def _fetch_genre_name(self, genre_id: str) -> str:
-        """Fetch genre name by ID from v2 API."""
-        if genre_id in self._genre_name_cache:
-            return self._genre_name_cache[genre_id]
-
-        self._rate_limit()
-        url = f"{self.BASE_URL}/genres/{genre_id}"
-        resp = requests.get(url, headers=self._get_headers(), timeout=30)
-
-        if resp.status_code == 200:
-            name = resp.json()["data"]["attributes"]["genreName"]
-            self._genre_name_cache[genre_id] = name
-            return name
-        else:
-            log.warning(f"Failed to fetch genre {genre_id}: {resp.status_code}")
-            return f"Unknown({genre_id})"
+        """Fetch genre name by ID from v2 API.
+
+        Concurrent callers asking for the same ID share a single request.
+        """
+        with self._lock:
+            future = self._genre_name_cache.get(genre_id)
+            owner = future is None
+            if owner:
+                future = self._genre_name_cache[genre_id] = Future()
+        if not owner:
+            return future.result()
+
+        # Settle the Future on every path, or waiters on this ID would block forever
+        try:
+            self.rate_limiter.wait()
+            url = f"{self.BASE_URL}/genres/{genre_id}"
+            resp = self._http.get(url, headers=self._get_headers(), timeout=30)
+
+            if resp.status_code == 200:
+                name = self._parse_genre_name(resp.json()["data"])
+            else:
+                log.warning(f"Failed to fetch genre {genre_id}: {resp.status_code}")
+                # Don't keep failures; the next lookup of this ID retries
+                with self._lock:
+                    del self._genre_name_cache[genre_id]
+                name = f"Unknown({genre_id})"
+        except BaseException as e:
+            with self._lock:
+                self._genre_name_cache.pop(genre_id, None)
+            future.set_exception(e)
+            raise
+
+        future.set_result(name)
+        return name
+
+    def _cache_genre_name(self, genre_id: str, name: str) -> None:
+        """Record a genre name resolved elsewhere (e.g. an included resource)."""
+        with self._lock:
+            if genre_id not in self._genre_name_cache:
+                future: Future[str] = Future()
+                future.set_result(name)
+                self._genre_name_cache[genre_id] = future
+
+    def _cached_genres(self, cache_key: str) -> list[str] | None:
+        """Return cached genres for a key, or None if it needs fetching.
+
+        Failed lookups are cached as {"genres": [], "failed_at": ts} and
+        count as cached until NEGATIVE_CACHE_TTL_SECONDS has passed.
+        """
+        entry = self.cache.get(cache_key)
+        if isinstance(entry, dict):
+            if time.time() - entry.get("failed_at", 0.0) < self.NEGATIVE_CACHE_TTL_SECONDS:
+                return entry.get("genres", [])
+            return None
+        return entry
 
-    def get_track_genres(self, track_id: str) -> list[str]:
-        """Get genre names for a track."""
+    def get_track_genres(self, track_id: str) -> list[str] | None:
+        """Get genre names for a track, None if the lookup failed and should be retried."""
         cache_key = f"track:{track_id}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        cached = self._cached_genres(cache_key)
+        if cached is not None:
+            return cached
 
-        self._rate_limit()
+        self.rate_limiter.wait()
         url = f"{self.BASE_URL}/tracks/{track_id}?include=genres"
-        resp = requests.get(url, headers=self._get_headers(), timeout=30)
+        resp = self._http.get(url, headers=self._get_headers(), timeout=30)
 
         if resp.status_code != 200:
             log.warning(f"Failed to fetch track {track_id}: {resp.status_code}")
-            return []
-
-        data = resp.json()
-        genre_refs = data.get("data", {}).get("relationships", {}).get("genres", {}).get("data", [])
-        genre_ids = [g["id"] for g in genre_refs]
+            # Remember tracks Tidal doesn't know; other errors are usually transient
+            if resp.status_code == 404:
+                with self._lock:
+                    self.cache[cache_key] = {"genres": [], "failed_at": time.time()}
+                    self._dirty = True
+                return []
+            return None
 
-        genres = [self._fetch_genre_name(gid) for gid in genre_ids]
-        self.cache[cache_key] = genres
+        genres = [self._fetch_genre_name(gid) for gid in self._genre_ids(resp.json().get("data", {}))]
+        with self._lock:
+            self.cache[cache_key] = genres
+            self._dirty = True
         return genres
 
+    def get_track_genres_bulk(self, track_ids: list[str]) -> dict[str, list[str]]:
+        """Get genre names for many tracks, BULK_SIZE tracks per request.
+
+        Genre names come from the compound document's included resources, so
+        no per-genre requests are needed. Tracks missing from the response are
+        left uncached for get_track_genres to retry individually.
+        """
+        results: dict[str, list[str]] = {}
+        uncached: list[str] = []
+        for track_id in track_ids:
+            cached = self._cached_genres(f"track:{track_id}")
+            if cached is not None:
+                results[track_id] = cached
+            else:
+                uncached.append(track_id)
+
+        for chunk in _chunk(uncached, self.BULK_SIZE):
+            # Bulk lookups are only a shortcut; on any failure the tracks fall back to per-track lookups
+            try:
+                self.rate_limiter.wait()
+                resp = self._http.get(
+                    f"{self.BASE_URL}/tracks",
+                    params={"filter[id]": ",".join(chunk), "include": "genres"},
+                    headers=self._get_headers(),
+                    timeout=30,
+                )
+
+                if resp.status_code != 200:
+                    log.warning(f"Failed to fetch {len(chunk)} tracks in bulk: {resp.status_code}")
+                    continue
+
+                data = resp.json()
+                for resource in data.get("included", []):
+                    if resource.get("type") == "genres":
+                        self._cache_genre_name(resource["id"], self._parse_genre_name(resource))
+
+                for track in data.get("data", []):
+                    genres = [self._fetch_genre_name(gid) for gid in self._genre_ids(track)]
+                    with self._lock:
+                        self.cache[f"track:{track['id']}"] = genres
+                        self._dirty = True
+                    results[track["id"]] = genres
+            except (requests.RequestException, KeyError, ValueError) as e:
+                log.warning(f"Failed to fetch {len(chunk)} tracks in bulk: {e}")
+                continue
+
+        return results
+
+    @staticmethod
+    def _parse_genre_name(genre: dict[str, Any]) -> str:
+        """Extract the display name from a genre resource."""
+        return genre["attributes"]["genreName"]
+
+    @staticmethod
+    def _genre_ids(track: dict[str, Any]) -> list[str]:
+        """Extract genre IDs from a track resource's relationships."""
+        genre_refs = track.get("relationships", {}).get("genres", {}).get("data", [])
+        return [g["id"] for g in genre_refs]
+
+    def reset_negative_cache(self) -> list[str]:
+        """Drop cached failures and empty results; return the affected track IDs."""
+        with self._lock:
+            stale = [key for key, entry in self.cache.items() if isinstance(entry, dict) or not entry]
+            for key in stale:
+                del self.cache[key]
+            self._dirty = self._dirty or bool(stale)
+        return [key.removeprefix("track:") for key in stale]
+
     def save(self) -> None:
-        """Persist cache to disk."""
-        save_json(self.cache_path, self.cache)
+        """Persist cache to disk if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self.cache)
+            self._dirty = False
+        save_json(self.cache_path, snapshot)
+
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        self._http.close()
 
 
 # --- Spotify Genre Client (fallback) ---
@@ -144,77 +386,140 @@ class SpotifyClient:
         self.client_secret = client_secret
         self.cache_path = Path(cache_path)
         self.cache: dict[str, Any] = load_json(self.cache_path)
-        self.min_interval = min_interval_seconds
-        self.last_request_time = 0.0
+        self.rate_limiter = RateLimiter(min_interval_seconds)
+        self._http = make_http_session()
+        self._dirty = False
         self._access_token: str | None = None
         self._token_expires: float = 0.0
-
-    def _rate_limit(self) -> None:
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_request_time = time.time()
+        self._lock = threading.Lock()
+        self._token_lock = threading.Lock()
+
+        # Reuse a still-valid token from a previous run
+        self.token_path = self.cache_path.with_suffix(".token.json")
+        saved_token = load_json(self.token_path)
+        if (
+            saved_token.get("token")
+            and saved_token.get("client_id") == client_id
+            and time.time() < saved_token.get("expires", 0.0)
+        ):
+            self._access_token = saved_token["token"]
+            self._token_expires = saved_token["expires"]
 
     def _get_access_token(self) -> str:
-        if self._access_token and time.time() < self._token_expires:
+        with self._token_lock:
+            if self._access_token and time.time() < self._token_expires:
+                return self._access_token
+
+            self.rate_limiter.wait()
+            resp = self._http.post(
+                self.TOKEN_URL,
+                data={"grant_type": "client_credentials"},
+                auth=(self.client_id, self.client_secret),
+                timeout=30,
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            self._access_token = data["access_token"]
+            self._token_expires = time.time() + data["expires_in"] - 60
+            save_json(
+                self.token_path,
+                {"client_id": self.client_id, "token": self._access_token, "expires": self._token_expires},
+                private=True,
+            )
             return self._access_token
 
-        self._rate_limit()
-        resp = requests.post(
-            self.TOKEN_URL,
-            data={"grant_type": "client_credentials"},
-            auth=(self.client_id, self.client_secret),
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        self._access_token = data["access_token"]
-        self._token_expires = time.time() + data["expires_in"] - 60
-        return self._access_token
-
-    def get_artist_genres(self, artist: str) -> list[str]:
+    def _invalidate_token(self, token: str) -> None:
+        """Forget a rejected token, in memory and on disk."""
+        with self._token_lock:
+            # Another thread may already have replaced it
+            if self._access_token != token:
+                return
+            self._access_token = None
+            self._token_expires = 0.0
+            self.token_path.unlink(missing_ok=True)
+
+    def get_artist_genres(self, artist: str) -> list[str] | None:
+        """Get genres for an artist, None if the lookup failed and should be retried."""
         cache_key = f"artist:{artist.lower()}"
         if cache_key in self.cache:
             return self.cache[cache_key]
 
-        self._rate_limit()
-        token = self._get_access_token()
-        resp = requests.get(
-            self.SEARCH_URL,
-            params={"q": artist, "type": "artist", "limit": 1},
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=30,
-        )
+        # A 401 means the token was revoked or belongs to rotated credentials: refresh once
+        for attempt in range(2):
+            self.rate_limiter.wait()
+            token = self._get_access_token()
+            resp = self._http.get(
+                self.SEARCH_URL,
+                params={"q": artist, "type": "artist", "limit": 1},
+                headers={"Authorization": f"Bearer {token}"},
+                timeout=30,
+            )
+            if resp.status_code != 401 or attempt:
+                break
+            self._invalidate_token(token)
 
         if resp.status_code != 200:
             log.warning(f"Spotify search failed for {artist}: {resp.status_code}")
-            return []
+            return None
 
         items = resp.json().get("artists", {}).get("items", [])
         genres = items[0]["genres"] if items else []
-        self.cache[cache_key] = genres
+        with self._lock:
+            self.cache[cache_key] = genres
+            self._dirty = True
         return genres
 
+    def reset_negative_cache(self) -> list[str]:
+        """Drop cached empty results; return the affected artist keys."""
+        with self._lock:
+            stale = [key for key, entry in self.cache.items() if not entry]
+            for key in stale:
+                del self.cache[key]
+            self._dirty = self._dirty or bool(stale)
+        return stale
+
     def save(self) -> None:
-        save_json(self.cache_path, self.cache)
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self.cache)
+            self._dirty = False
+        save_json(self.cache_path, snapshot)
+
+    def close(self) -> None:
+        self._http.close()
 
 
 # --- Main Automation ---
 class TidalAutomation:
     """Main automation class for filtering and managing playlists."""
 
-    def __init__(self, config: dict[str, Any], dry_run: bool = False) -> None:
+    CHECKPOINT_INTERVAL_SECONDS = 60
+
+    def __init__(self, config: dict[str, Any], dry_run: bool = False, reset_negative_cache: bool = False) -> None:
         self.config = config
         self.dry_run = dry_run
+        self.reset_negative_cache = reset_negative_cache
         self.session: tidalapi.Session | None = None
         self.genre_client: TidalGenreClient | None = None
         self.spotify_client: SpotifyClient | None = None
-        self.processed_path = Path(config.get("processed_tracks_path", "cache/processed_tracks.json"))
-        self.processed_tracks: set[str] = set(load_json(self.processed_path).get("tracks", []))
-        self.removed_path = Path("cache/removed_tracks.json")
-        self.removed_tracks: set[str] = set(load_json(self.removed_path).get("tracks", []))
-        self.snapshot_path = Path("cache/destination_snapshot.json")
-        self.destination_snapshot: set[str] = set(load_json(self.snapshot_path).get("tracks", []))
+        self.processed_path = Path(config.get("processed_tracks_path", "cache/processed_tracks.bin"))
+        if self.processed_path.suffix == ".json":
+            # Legacy configs point at the old JSON file; keep binary data out of it
+            # (load_ids still reads the .json file until the .bin one exists)
+            bin_path = self.processed_path.with_suffix(".bin")
+            log.warning(f"processed_tracks_path {self.processed_path} is a legacy JSON path, using {bin_path}")
+            self.processed_path = bin_path
+        self.processed_tracks: set[str] = load_ids(self.processed_path)
+        self.removed_path = Path("cache/removed_tracks.bin")
+        self.removed_tracks: set[str] = load_ids(self.removed_path)
+        self.snapshot_path = Path("cache/destination_snapshot.bin")
+        self.destination_snapshot: set[str] = load_ids(self.snapshot_path)
+        self.dest_id_path = Path("cache/dest_id.json")
+        # Blocklist is matched once per track, so precompile it
+        blocklist = [b.lower() for b in config.get("genre_blocklist", [])]
+        self._block_re = re.compile("|".join(re.escape(b) for b in blocklist)) if blocklist else None
+        self._blocklist_joined = "\0".join(blocklist)
 
     def login(self) -> bool:
         """Initialize Tidal session from saved credentials."""
@@ -226,6 +531,13 @@ class TidalAutomation:
             return False
 
         self.session = tidalapi.Session()
+        # Back off and retry only 429 responses (the request was not applied, so any method
+        # is safe to resend); connection/read errors are not retried, as the write may have landed
+        retry = Retry(
+            total=3, connect=0, read=0, other=0,
+            backoff_factor=0.3, status_forcelist=[429], allowed_methods=None, raise_on_status=False,
+        )
+        self.session.request_session.mount("https://", HTTPAdapter(max_retries=retry))
         try:
             self.session.load_session_from_file(session_path)
             if not self.session.check_login():
@@ -265,8 +577,19 @@ class TidalAutomation:
             log.error(f"Unknown genre_detection method: {genre_detection}")
             sys.exit(1)
 
-    def _get_genres(self, track: tidalapi.Track) -> list[str]:
-        """Get genres for a track using configured method."""
+        if self.reset_negative_cache:
+            if self.genre_client:
+                # Un-mark the tracks too, or filter_playlist would skip them before any lookup
+                track_ids = self.genre_client.reset_negative_cache()
+                self.processed_tracks.difference_update(track_ids)
+                log.info(f"Cleared {len(track_ids)} cached unknown-genre lookups; those tracks will be re-checked")
+            else:
+                artists = self.spotify_client.reset_negative_cache()
+                log.info(f"Cleared {len(artists)} cached unknown-genre artists "
+                         "(Spotify genres are per artist, so already processed tracks are not re-checked)")
+
+    def _get_genres(self, track: tidalapi.Track) -> list[str] | None:
+        """Get genres for a track using configured method, None if the lookup failed."""
         if self.genre_client:
             return self.genre_client.get_track_genres(str(track.id))
         elif self.spotify_client:
@@ -274,15 +597,14 @@ class TidalAutomation:
         return []
 
     def _is_blocked(self, genres: list[str]) -> bool:
-        """Check if any genre matches the blocklist."""
-        blocklist = self.config.get("genre_blocklist", [])
-        genres_lower = [g.lower() for g in genres]
-
-        for blocked in blocklist:
-            blocked_lower = blocked.lower()
-            for genre in genres_lower:
-                if blocked_lower in genre or genre in blocked_lower:
-                    return True
+        """Check if any genre matches the blocklist (either contains the other)."""
+        if self._block_re is None:
+            return False
+        for genre in genres:
+            genre_lower = genre.lower()
+            # A genre never contains NUL, so it can't match across joined entries
+            if self._block_re.search(genre_lower) or genre_lower in self._blocklist_joined:
+                return True
         return False
 
     def _get_or_create_destination_playlist(self) -> tidalapi.Playlist | None:
@@ -296,11 +618,24 @@ class TidalAutomation:
             except Exception as e:
                 log.warning(f"Could not fetch destination playlist {dest_id}: {e}")
 
+        # Reuse the playlist found or created by a previous run
+        cached = load_json(self.dest_id_path)
+        cached_id = cached.get("destination_playlist_id")
+        if cached_id and cached.get("name") == dest_name:
+            try:
+                pl = self.session.playlist(cached_id)
+                if pl.name == dest_name:
+                    return pl
+                log.info(f"Cached destination playlist {cached_id} was renamed, searching again")
+            except Exception as e:
+                log.warning(f"Cached destination playlist {cached_id} is gone, searching again: {e}")
+
         # Search in user's playlists
         user_playlists = self.session.user.playlists()
         for pl in user_playlists:
             if pl.name == dest_name:
                 log.info(f"Found existing destination playlist: {pl.name} ({pl.id})")
+                self._remember_destination(pl)
                 return pl
 
         # Create new playlist
@@ -309,56 +644,180 @@ class TidalAutomation:
             return None
 
         log.info(f"Creating destination playlist: {dest_name}")
-        return self.session.user.create_playlist(dest_name, f"Filtered new music - updated {datetime.now(timezone.utc).strftime('%Y-%m-%d')}")
+        pl = self.session.user.create_playlist(dest_name, f"Filtered new music - updated {datetime.now(timezone.utc).strftime('%Y-%m-%d')}")
+        self._remember_destination(pl)
+        return pl
+
+    def _remember_destination(self, playlist: tidalapi.Playlist) -> None:
+        """Cache the resolved destination playlist so later runs skip the search."""
+        save_json(self.dest_id_path, {"destination_playlist_id": playlist.id, "name": playlist.name})
 
     def _get_destination_track_ids(self, playlist: tidalapi.Playlist) -> set[str]:
         """Get all track IDs currently in destination playlist."""
         tracks = playlist.tracks()
         return {str(t.id) for t in tracks}
 
-    def filter_playlist(self, source_playlist_id: str) -> list[tidalapi.Track]:
-        """Filter a source playlist and return tracks to add."""
+    def _add_in_chunks(self, playlist: tidalapi.Playlist, track_ids: list[str], size: int = 100) -> None:
+        """Add tracks to a playlist in chunks, retrying rate-limited/server errors with backoff.
+
+        Chunks are sent one at a time: tidalapi guards playlist edits with an
+        ETag, so concurrent writers to the same playlist would conflict.
+        """
+        for chunk in _chunk(track_ids, size):
+            self._add_with_retry(playlist.add, chunk, playlist.name)
+
+    def _add_with_retry(self, add: Callable[[list[str]], Any], chunk: list[str], target: str) -> None:
+        """Send one chunk of track IDs, retrying rate-limited/server errors with backoff."""
+        attempts = 4
+        for attempt in range(attempts):
+            try:
+                add(chunk)
+                return
+            except (requests.HTTPError, TooManyRequests) as e:
+                # tidalapi raises TooManyRequests for 429s, HTTPError for the rest
+                if isinstance(e, TooManyRequests):
+                    status = 429
+                    delay = e.retry_after if e.retry_after > 0 else 2 ** attempt
+                else:
+                    status = e.response.status_code if e.response is not None else 0
+                    delay = 2 ** attempt
+                if attempt == attempts - 1 or not (status == 429 or status >= 500):
+                    raise
+                log.warning(f"Adding {len(chunk)} tracks to {target} failed ({status}), retrying in {delay}s")
+                time.sleep(delay)
+
+    def _fetch_destination(self) -> tuple[tidalapi.Playlist | None, set[str]]:
+        """Get or create the destination playlist along with its track IDs."""
+        dest_playlist = self._get_or_create_destination_playlist()
+        if dest_playlist is None:
+            return None, set()
+        return dest_playlist, self._get_destination_track_ids(dest_playlist)
+
+    def _fetch_source_playlist(
+        self, source_playlist_id: str
+    ) -> tuple[tidalapi.Playlist, list[tidalapi.Track]] | None:
+        """Fetch a source playlist and its tracks, None if it can't be fetched."""
         try:
             source = self.session.playlist(source_playlist_id)
         except Exception as e:
             log.error(f"Could not fetch source playlist {source_playlist_id}: {e}")
-            return []
+            return None
+        return source, source.tracks()
+
+    def filter_playlist(
+        self, source: tidalapi.Playlist, tracks: list[tidalapi.Track], existing_track_ids: set[str]
+    ) -> dict[str, tidalapi.Track]:
+        """Filter a source playlist's tracks and return new tracks to add, keyed by track ID.
 
-        log.info(f"Processing playlist: {source.name} ({len(source.tracks())} tracks)")
+        Tracks already in existing_track_ids or removed by the user are left out.
+        """
+        log.info(f"Processing playlist: {source.name} ({source.num_tracks} tracks)")
 
-        tracks_to_add = []
-        for track in source.tracks():
+        # Collect unprocessed tracks (deduplicated, in playlist order)
+        pending: dict[str, tidalapi.Track] = {}
+        for track in tracks:
             track_id = str(track.id)
 
             # Skip already processed
             if track_id in self.processed_tracks:
                 log.debug(f"Skipping already processed: {track.name}")
                 continue
+            pending.setdefault(track_id, track)
 
-            # Get genres
-            genres = self._get_genres(track)
-            genres_str = ", ".join(genres) if genres else "unknown"
+        # Resolve Tidal genres in bulk first; anything left is fetched per track below
+        if self.genre_client:
+            self.genre_client.get_track_genres_bulk(list(pending))
+
+        # Fetch genres on worker threads (network-bound; the clients share one rate limit)
+        # and decide on each track as soon as its genres arrive
+        results: queue.Queue[tuple[str, tidalapi.Track, list[str]] | None] = queue.Queue(maxsize=32)
+        max_workers = self.config.get("genre_lookup_workers", 8)
+
+        stop = threading.Event()
+
+        def put(item: tuple[str, tidalapi.Track, list[str]] | None) -> None:
+            # Time out periodically so workers can leave once the consumer has stopped
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    pass
+
+        def fetch(track_id: str, track: tidalapi.Track) -> None:
+            if stop.is_set():
+                return
+            try:
+                genres = self._get_genres(track)
+            except Exception as e:
+                log.warning(f"Genre lookup failed for {track.artist.name} - {track.name}: {e}")
+                return
+            # Failed lookups leave the track unprocessed, so the next run retries it
+            if genres is not None:
+                put((track_id, track, genres))
 
-            # Check blocklist
-            if self._is_blocked(genres):
-                log.info(f"BLOCKED: {track.artist.name} - {track.name} [{genres_str}]")
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        for track_id, track in pending.items():
+            executor.submit(fetch, track_id, track)
+
+        def finish() -> None:
+            executor.shutdown(wait=True)
+            put(None)
+
+        producer = threading.Thread(target=finish, daemon=True)
+        producer.start()
+
+        kept: set[str] = set()
+        last_checkpoint = time.monotonic()
+        try:
+            while (item := results.get()) is not None:
+                track_id, track, genres = item
+                if self._should_add(track, genres):
+                    kept.add(track_id)
                 self.processed_tracks.add(track_id)
-                continue
 
-            # Handle unknown genres
-            if not genres:
-                policy = self.config.get("unknown_genre_policy", "keep")
-                if policy == "skip":
-                    log.info(f"SKIPPED (unknown genre): {track.artist.name} - {track.name}")
-                    self.processed_tracks.add(track_id)
-                    continue
-                log.info(f"KEEPING (unknown genre): {track.artist.name} - {track.name}")
+                # Checkpoint fetched genres so a crash mid-run doesn't lose them. Each save
+                # rewrites the whole cache file, so do it on a timer, not per N tracks.
+                if time.monotonic() - last_checkpoint >= self.CHECKPOINT_INTERVAL_SECONDS:
+                    self._save_genre_caches()
+                    last_checkpoint = time.monotonic()
+        finally:
+            # If we stopped early, release workers blocked on the full queue
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+        producer.join()
+
+        # Drop duplicates and user-removed tracks in one set operation, then
+        # keep playlist order regardless of lookup completion order
+        add_ids = kept - existing_track_ids - self.removed_tracks
+        return {track_id: track for track_id, track in pending.items() if track_id in add_ids}
+
+    def _should_add(self, track: tidalapi.Track, genres: list[str]) -> bool:
+        """Apply the blocklist and unknown-genre policy to a track."""
+        genres_str = ", ".join(genres) if genres else "unknown"
+
+        # Check blocklist
+        if self._is_blocked(genres):
+            log.info(f"BLOCKED: {track.artist.name} - {track.name} [{genres_str}]")
+            return False
 
-            log.info(f"ADDING: {track.artist.name} - {track.name} [{genres_str}]")
-            tracks_to_add.append(track)
-            self.processed_tracks.add(track_id)
+        # Handle unknown genres
+        if not genres:
+            policy = self.config.get("unknown_genre_policy", "keep")
+            if policy == "skip":
+                log.info(f"SKIPPED (unknown genre): {track.artist.name} - {track.name}")
+                return False
+            log.info(f"KEEPING (unknown genre): {track.artist.name} - {track.name}")
 
-        return tracks_to_add
+        log.info(f"ADDING: {track.artist.name} - {track.name} [{genres_str}]")
+        return True
+
+    def _save_genre_caches(self) -> None:
+        """Persist whichever genre client caches are in use."""
+        if self.genre_client:
+            self.genre_client.save()
+        if self.spotify_client:
+            self.spotify_client.save()
 
     def run_filter(self) -> None:
         """Filter new arrivals and add to destination playlist."""
@@ -373,36 +832,36 @@ class TidalAutomation:
             log.error("No source_playlist_ids configured")
             sys.exit(1)
 
-        # Get or create destination playlist
-        dest_playlist = self._get_or_create_destination_playlist()
-
-        # Get existing tracks in destination (for duplicate avoidance)
-        existing_track_ids: set[str] = set()
-        if dest_playlist:
-            existing_track_ids = self._get_destination_track_ids(dest_playlist)
-            log.info(f"Destination playlist has {len(existing_track_ids)} existing tracks")
-
-        # Detect user removals: tracks in our last snapshot that are no longer in the playlist
-        if self.destination_snapshot:
-            removed = self.destination_snapshot - existing_track_ids
-            if removed:
-                log.info(f"Detected {len(removed)} tracks removed by user — permanently excluding")
-                self.removed_tracks.update(removed)
-
-        if self.removed_tracks:
-            log.info(f"Total removed tracks (never re-add): {len(self.removed_tracks)}")
-
-        # Filter all source playlists
-        all_tracks_to_add: list[tidalapi.Track] = []
-        for source_id in source_ids:
-            filtered = self.filter_playlist(source_id)
-            # Remove duplicates (already in destination) and user-removed tracks
-            new_tracks = [t for t in filtered
-                          if str(t.id) not in existing_track_ids
-                          and str(t.id) not in self.removed_tracks]
-            all_tracks_to_add.extend(new_tracks)
-            # Update existing set to avoid duplicates between sources
-            existing_track_ids.update(str(t.id) for t in new_tracks)
+        # Fetch the destination (with its tracks) and all source playlists concurrently
+        all_tracks_to_add: dict[str, tidalapi.Track] = {}
+        with ThreadPoolExecutor(max_workers=len(source_ids) + 1) as executor:
+            dest_future = executor.submit(self._fetch_destination)
+            source_futures = [executor.submit(self._fetch_source_playlist, sid) for sid in source_ids]
+
+            # Get existing tracks in destination (for duplicate avoidance)
+            dest_playlist, existing_track_ids = dest_future.result()
+            if dest_playlist:
+                log.info(f"Destination playlist has {len(existing_track_ids)} existing tracks")
+
+            # Detect user removals: tracks in our last snapshot that are no longer in the playlist
+            if self.destination_snapshot:
+                removed = self.destination_snapshot - existing_track_ids
+                if removed:
+                    log.info(f"Detected {len(removed)} tracks removed by user — permanently excluding")
+                    self.removed_tracks.update(removed)
+
+            if self.removed_tracks:
+                log.info(f"Total removed tracks (never re-add): {len(self.removed_tracks)}")
+
+            # Filter all source playlists
+            for future in source_futures:
+                fetched = future.result()
+                if fetched is None:
+                    continue
+                new_tracks = self.filter_playlist(*fetched, existing_track_ids)
+                all_tracks_to_add.update(new_tracks)
+                # Update existing set to avoid duplicates between sources
+                existing_track_ids.update(new_tracks)
 
         if not all_tracks_to_add:
             log.info("No new tracks to add")
@@ -410,22 +869,22 @@ class TidalAutomation:
             log.info(f"[DRY RUN] Would add {len(all_tracks_to_add)} tracks to destination playlist")
         else:
             # Add tracks to destination
-            track_ids = [str(t.id) for t in all_tracks_to_add]
+            track_ids = list(all_tracks_to_add)
             log.info(f"Adding {len(track_ids)} tracks to {dest_playlist.name}")
-            dest_playlist.add(track_ids)
+            self._add_in_chunks(dest_playlist, track_ids)
             existing_track_ids.update(track_ids)
 
-        # Save caches
-        if self.genre_client:
-            self.genre_client.save()
-        if self.spotify_client:
-            self.spotify_client.save()
+        # Save caches and release HTTP connections
+        self._save_genre_caches()
+        for client in (self.genre_client, self.spotify_client):
+            if client:
+                client.close()
 
         # Save processed tracks, removed tracks, and destination snapshot (skip in dry-run mode)
         if not self.dry_run:
-            save_json(self.processed_path, {"tracks": list(self.processed_tracks)})
-            save_json(self.removed_path, {"tracks": list(self.removed_tracks)})
-            save_json(self.snapshot_path, {"tracks": list(existing_track_ids)})
+            save_ids(self.processed_path, self.processed_tracks)
+            save_ids(self.removed_path, self.removed_tracks)
+            save_ids(self.snapshot_path, existing_track_ids)
         log.info("Done!")
 
     def run_rotate(self) -> None:
@@ -476,7 +935,7 @@ class TidalAutomation:
         # Add to archive (appends to bottom)
         track_ids = [str(t.id) for t in tracks_to_rotate]
         log.info(f"Adding {len(track_ids)} tracks to {archive.name}")
-        archive.add(track_ids)
+        self._add_in_chunks(archive, track_ids)
 
         # Remove from master
         # tidalapi uses index for removal, tracks are at indices 0 to overflow-1
@@ -520,43 +979,53 @@ class TidalAutomation:
 
         log.info(f"Currently have {len(current_fav_ids)} favorited tracks")
 
-        # Collect all unique track IDs to like
-        tracks_to_like: list[tuple[str, str, str]] = []  # (id, artist, name)
-        seen_ids: set[str] = set()
-
-        for pl in playlists:
-            log.info(f"Processing {pl.name}...")
-            for track in pl.tracks(limit=10000):
-                track_id = str(track.id)
-                if track_id not in seen_ids and track_id not in current_fav_ids:
-                    tracks_to_like.append((track_id, track.artist.name, track.name))
-                    seen_ids.add(track_id)
-
-        if not tracks_to_like:
-            log.info("All tracks are already favorited!")
-            return
-
-        log.info(f"Found {len(tracks_to_like)} tracks to favorite")
+        def iter_candidates() -> Iterator[tidalapi.Track]:
+            """Yield each unique, not yet favorited track across the playlists."""
+            seen_ids: set[str] = set()
+            for pl in playlists:
+                log.info(f"Processing {pl.name}...")
+                for track in pl.tracks(limit=10000):
+                    track_id = str(track.id)
+                    if track_id not in seen_ids and track_id not in current_fav_ids:
+                        seen_ids.add(track_id)
+                        yield track
 
         if self.dry_run:
+            tracks_to_like = [(track.artist.name, track.name) for track in iter_candidates()]
+            if not tracks_to_like:
+                log.info("All tracks are already favorited!")
+                return
+            log.info(f"Found {len(tracks_to_like)} tracks to favorite")
             log.info(f"[DRY RUN] Would favorite {len(tracks_to_like)} tracks")
-            for tid, artist, name in tracks_to_like[:10]:
+            for artist, name in tracks_to_like[:10]:
                 log.info(f"  {artist} - {name}")
             if len(tracks_to_like) > 10:
                 log.info(f"  ... and {len(tracks_to_like) - 10} more")
             return
 
-        # Like tracks
+        # Like tracks as they are found, 100 per request (add_track accepts a list of IDs)
         favorites = self.session.user.favorites
         liked = 0
-        for i, (track_id, artist, name) in enumerate(tracks_to_like, 1):
+        done = 0
+        for chunk in _chunk(iter_candidates(), 100):
+            done += len(chunk)
             try:
-                favorites.add_track(int(track_id))
-                liked += 1
-                if i % 100 == 0:
-                    log.info(f"Progress: {i}/{len(tracks_to_like)} tracks liked")
+                self._add_with_retry(favorites.add_track, [str(t.id) for t in chunk], "favorites")
+                liked += len(chunk)
             except Exception as e:
-                log.warning(f"Failed to like {artist} - {name}: {e}")
+                # Retry one by one so a single bad ID can't drop the whole batch
+                log.warning(f"Failed to like a batch of {len(chunk)} tracks ({e}), retrying individually")
+                for track in chunk:
+                    try:
+                        self._add_with_retry(favorites.add_track, [str(track.id)], "favorites")
+                        liked += 1
+                    except Exception as track_error:
+                        log.warning(f"Failed to like {track.artist.name} - {track.name}: {track_error}")
+            log.info(f"Progress: {done} tracks processed, {liked} liked")
+
+        if not done:
+            log.info("All tracks are already favorited!")
+            return
 
         log.info(f"Liked {liked} tracks!")
 
@@ -588,6 +1057,8 @@ def main() -> None:
     parser.add_argument("--config", default="config.json", help="Path to config file")
     parser.add_argument("--dry-run", action="store_true", help="Preview changes without modifying playlists")
     parser.add_argument("--login", action="store_true", help="Perform OAuth login")
+    parser.add_argument("--reset-negative-cache", action="store_true",
+                        help="Re-check tracks whose Tidal genre lookup previously returned 404 or no genres")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable debug logging")
     args = parser.parse_args()
 
@@ -612,7 +1083,7 @@ def main() -> None:
         do_login(config)
         return
 
-    automation = TidalAutomation(config, dry_run=dry_run)
+    automation = TidalAutomation(config, dry_run=dry_run, reset_negative_cache=args.reset_negative_cache)
 
     if args.command == "filter":
         automation.run_filter()